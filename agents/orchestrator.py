@@ -1,4 +1,6 @@
 # agents/orchestrator.py
+from contextlib import nullcontext
+
 from agents.extractor_agent import ExtractorAgent
 from agents.interpreter_agent import InterpreterAgent
 from agents.safety_agent import SafetyAgent
@@ -6,69 +8,94 @@ from agents.recommender_agent import RecommenderAgent
 
 
 class Orchestrator:
-    def __init__(self, mode="offline"):
+    def __init__(self, mode="offline", tracer=None):
         """
         Orchestrates the complete pipeline of:
         1) Extraction
         2) Interpretation
         3) Safety Check
         4) Recommendations
+
+        tracer: optional object with a `stage(name)` context manager,
+        used by agents/worker.py to measure memory per stage.
         """
         self.mode = mode
+        self.tracer = tracer
         self.extractor = ExtractorAgent()
         self.interpreter = InterpreterAgent()
         self.safety = SafetyAgent()
         self.recommender = RecommenderAgent()
 
-    def run_pipeline(self, report_text: str, sex="all"):
-        if not report_text or not report_text.strip():
-            return {
-                "error": True,
-                "message": "Report text is empty",
-                "extracted": [],
-                "interpreted": [],
-                "raw_summary": "",
-                "safe_summary": "",
-                "recommendations": []
-            }
+    def _stage(self, name: str):
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.stage(name)
 
-        try:
-            # Step 1: Extract structured values
+    def error_result(self, message: str):
+        return {
+            "error": True,
+            "message": message,
+            "extracted": [],
+            "interpreted": [],
+            "raw_summary": "",
+            "safe_summary": "",
+            "recommendations": []
+        }
+
+    def prepass(self, report_text: str, sex="all"):
+        """
+        Cheap stages only (extraction + interpretation). Used by
+        agents/scheduler.py to find urgent findings before the rest runs.
+        """
+        # Step 1: Extract structured values
+        with self._stage("extract"):
             extracted_resp = self.extractor.run(report_text)
-            extracted = extracted_resp.get("extracted", [])
+            extracted = extracted_resp.get("facts", [])
+
+        # Step 2: Interpret values (Low / High / Normal)
+        with self._stage("interpret"):
+            interpreted = self.interpreter.run(extracted, patient_info={"sex": sex})
 
-            # Step 2: Interpret values (Low / High / Normal)
-            interpreted = self.interpreter.run(extracted, sex=sex)
+        return {
+            "extracted": extracted,
+            "interpreted": interpreted,
+            "urgent": [i for i in interpreted if i.get("urgency") == "urgent"],
+        }
 
-            # Step 3: Create human-readable summary
+    def complete(self, pre: dict):
+        """Remaining stages on the output of prepass()."""
+        interpreted = pre["interpreted"]
+
+        # Step 3: Create human-readable summary
+        with self._stage("summarize"):
             raw_summary = "\n".join(
                 f"{i['name'].title()}: {i['status']} — {i['explanation']}"
                 for i in interpreted
             )
 
-            # Step 4: Safety re-check (remove harmful medical claims)
+        # Step 4: Safety re-check (remove harmful medical claims)
+        with self._stage("safety"):
             safe_summary = self.safety.run(raw_summary)
 
-            # Step 5: Lifestyle / diet recommendations
+        # Step 5: Lifestyle / diet recommendations
+        with self._stage("recommend"):
             recommendations = self.recommender.run(interpreted)
 
-            return {
-                "error": False,
-                "extracted": extracted,
-                "interpreted": interpreted,
-                "raw_summary": raw_summary,
-                "safe_summary": safe_summary,
-                "recommendations": recommendations
-            }
+        return {
+            "error": False,
+            "extracted": pre["extracted"],
+            "interpreted": interpreted,
+            "raw_summary": raw_summary,
+            "safe_summary": safe_summary,
+            "recommendations": recommendations
+        }
 
+    def run_pipeline(self, report_text: str, sex="all"):
+        if not report_text or not report_text.strip():
+            return self.error_result("Report text is empty")
+
+        try:
+            return self.complete(self.prepass(report_text, sex=sex))
         except Exception as e:
             # Protect backend from crashing due to any agent failure
-            return {
-                "error": True,
-                "message": f"Pipeline failed: {str(e)}",
-                "extracted": [],
-                "interpreted": [],
-                "raw_summary": "",
-                "safe_summary": "",
-                "recommendations": []
-            }
+            return self.error_result(f"Pipeline failed: {str(e)}")
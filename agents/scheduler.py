@@ -0,0 +1,246 @@
+# agents/scheduler.py
+"""
+PriorityScheduler
+Fast-paths reports with urgent findings through the pipeline.
+
+Every report first gets a cheap pre-pass (Orchestrator.prepass: extract +
+interpret). Reports with at least one `urgency == "urgent"` finding fire
+`on_alert` immediately and go to the high-priority queue; everything else
+waits in the normal queue for the expensive stages (Orchestrator.complete
+and, if given, the ADKMedAgent insight call).
+
+Modes:
+ - batch:   run_batch(reports) pre-passes the whole batch, then completes
+            urgent reports first
+ - service: start(), submit(...) from any thread, stop()
+
+Queue wait (pre-pass done → picked up by a worker) is recorded per priority
+class and reported by stats().
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from agents.orchestrator import Orchestrator
+
+HIGH = 0
+NORMAL = 1
+PRIORITY_NAMES = {HIGH: "high", NORMAL: "normal"}
+
+_STOP = object()
+
+# Extractor names → the keys ADKMedAgent._rule_based_insights looks up.
+# Glucose is deliberately not mapped to "blood_sugar": that rule's 6.4
+# threshold is an HbA1c percentage, not a glucose value in mg/dL.
+INSIGHT_FACT_NAMES = {"a1c": "HbA1c"}
+
+logger = logging.getLogger(__name__)
+
+
+class PriorityScheduler:
+    def __init__(
+        self,
+        orchestrator: Optional[Orchestrator] = None,
+        insight_agent=None,
+        on_alert: Optional[Callable[[Any, List[Dict[str, Any]]], None]] = None,
+        on_result: Optional[Callable[[Any, Dict[str, Any]], None]] = None,
+        workers: int = 2,
+        latency_window: int = 1000,
+    ):
+        """
+        insight_agent: optional ADKMedAgent (or compatible) run as the slow stage
+        on_alert(report_id, urgent_items): called right after the pre-pass
+        on_result(report_id, result): called when a report is fully processed
+        """
+        self.orchestrator = orchestrator or Orchestrator()
+        self.insight_agent = insight_agent
+        self.on_alert = on_alert
+        self.on_result = on_result
+        self.workers = max(1, workers)
+
+        self._work = queue.PriorityQueue()
+        self._intake = queue.Queue()
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._intake_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._waits = {p: deque(maxlen=latency_window) for p in PRIORITY_NAMES}
+        self._counts = {p: 0 for p in PRIORITY_NAMES}
+        self._max_wait = {p: 0.0 for p in PRIORITY_NAMES}
+
+    # ---- stages -------------------------------------------------------
+
+    def _prepass(self, report_id, report_text: str, sex: str):
+        """Run the cheap stages and enqueue the report by priority."""
+        if not report_text or not report_text.strip():
+            self._deliver_error(report_id, "Report text is empty")
+            return
+        try:
+            pre = self.orchestrator.prepass(report_text, sex=sex)
+        except Exception as e:
+            self._deliver_error(report_id, f"Pipeline failed: {str(e)}")
+            return
+
+        priority = HIGH if pre["urgent"] else NORMAL
+        if pre["urgent"] and self.on_alert:
+            try:
+                self.on_alert(report_id, pre["urgent"])
+            except Exception:
+                # A failing callback must not drop the report or kill the thread
+                logger.exception("on_alert failed for report %r", report_id)
+        self._work.put((priority, next(self._seq), time.perf_counter(), report_id, pre))
+
+    def _complete(self, report_id, pre: Dict[str, Any], priority: int):
+        try:
+            result = self.orchestrator.complete(pre)
+        except Exception as e:
+            result = self.orchestrator.error_result(f"Pipeline failed: {str(e)}")
+        else:
+            if self.insight_agent is not None:
+                result["insights"] = self._insights(pre)
+        result["priority"] = PRIORITY_NAMES[priority]
+        result["alerts"] = pre["urgent"]
+        self._deliver(report_id, result)
+
+    def _insights(self, pre: Dict[str, Any]) -> Dict[str, Any]:
+        facts = {
+            INSIGHT_FACT_NAMES.get(i["name"], i["name"]): i["value"]
+            for i in pre["interpreted"] if i.get("value") is not None
+        }
+        try:
+            return self.insight_agent.run(facts)
+        except Exception as e:
+            # Optional slow stage: a failure here keeps the finished result
+            logger.exception("insight agent failed")
+            return {"error": True, "message": f"Insights failed: {str(e)}"}
+
+    def _deliver_error(self, report_id, message: str):
+        # Same shape as a completed result, so on_result sees one format
+        result = self.orchestrator.error_result(message)
+        result["priority"] = PRIORITY_NAMES[NORMAL]
+        result["alerts"] = []
+        self._deliver(report_id, result)
+
+    def _deliver(self, report_id, result: Dict[str, Any]):
+        if self.on_result:
+            try:
+                self.on_result(report_id, result)
+            except Exception:
+                # A failing callback must not drop the report or kill the thread
+                logger.exception("on_result failed for report %r", report_id)
+
+    # ---- workers ------------------------------------------------------
+
+    def _record_wait(self, priority: int, wait: float):
+        with self._lock:
+            self._waits[priority].append(wait)
+            self._counts[priority] += 1
+            self._max_wait[priority] = max(self._max_wait[priority], wait)
+
+    def _work_loop(self):
+        while True:
+            priority, _, enqueued_at, report_id, pre = self._work.get()
+            try:
+                if pre is _STOP:
+                    return
+                self._record_wait(priority, time.perf_counter() - enqueued_at)
+                self._complete(report_id, pre, priority)
+            finally:
+                self._work.task_done()
+
+    def _intake_loop(self):
+        while True:
+            item = self._intake.get()
+            try:
+                if item is _STOP:
+                    return
+                self._prepass(*item)
+            finally:
+                self._intake.task_done()
+
+    def _start_workers(self):
+        for _ in range(self.workers):
+            t = threading.Thread(target=self._work_loop, daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _stop_workers(self):
+        # Sentinels sort after every real item, so queued work drains first.
+        for _ in range(self.workers):
+            self._work.put((NORMAL + 1, next(self._seq), 0.0, None, _STOP))
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+    # ---- batch mode ---------------------------------------------------
+
+    def run_batch(self, reports: Iterable[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """
+        reports: iterable of {"id": ..., "text": ..., "sex": "all"}
+        Returns {id: result}; results are also streamed through on_result.
+        Not available while service mode is running.
+        """
+        if self._intake_thread is not None:
+            raise RuntimeError("run_batch() cannot be used while the service is running; call stop() first")
+        results: Dict[Any, Dict[str, Any]] = {}
+        user_on_result = self.on_result
+
+        def collect(report_id, result):
+            results[report_id] = result
+            if user_on_result:
+                user_on_result(report_id, result)
+
+        self.on_result = collect
+        try:
+            # Pre-pass the whole batch before any expensive work starts.
+            for r in reports:
+                self._prepass(r["id"], r.get("text", ""), r.get("sex", "all"))
+            self._start_workers()
+            self._stop_workers()
+        finally:
+            self.on_result = user_on_result
+        return results
+
+    # ---- service mode -------------------------------------------------
+
+    def start(self):
+        if self._intake_thread is not None:
+            raise RuntimeError("Scheduler service is already running")
+        self._intake_thread = threading.Thread(target=self._intake_loop, daemon=True)
+        self._intake_thread.start()
+        self._start_workers()
+
+    def submit(self, report_id, report_text: str, sex: str = "all"):
+        self._intake.put((report_id, report_text, sex))
+
+    def stop(self):
+        """Finish everything already submitted, then shut down."""
+        if self._intake_thread is None:
+            return
+        self._intake.put(_STOP)
+        self._intake_thread.join()
+        self._stop_workers()
+        self._intake_thread = None
+
+    # ---- metrics ------------------------------------------------------
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Queue-wait latency per priority class, in milliseconds."""
+        out = {}
+        with self._lock:
+            for p, name in PRIORITY_NAMES.items():
+                waits = sorted(self._waits[p])
+                n = len(waits)
+                out[name] = {
+                    "count": self._counts[p],
+                    "avg_ms": round(sum(waits) / n * 1000, 3) if n else 0.0,
+                    "p50_ms": round(waits[n // 2] * 1000, 3) if n else 0.0,
+                    "p95_ms": round(waits[min(n - 1, int(n * 0.95))] * 1000, 3) if n else 0.0,
+                    "max_ms": round(self._max_wait[p] * 1000, 3),
+                }
+        return out
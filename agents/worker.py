@@ -0,0 +1,199 @@
+# agents/worker.py
+"""
+PipelineWorker
+Long-running worker mode for the Orchestrator.
+
+ - recycles the Orchestrator (and its agents) after `max_reports` reports
+   or once process RSS exceeds `max_rss_mb`
+ - every `sample_every`-th report gets an extra tracemalloc probe run that
+   records the allocation delta per pipeline stage and per report
+ - flags a suspected leak when the retained delta of the last
+   `leak_window` samples is consistently above `leak_threshold_kb`
+ - `health()` returns a JSON-serializable metrics dict for a health endpoint
+
+If RSS is still above the limit right after a recycle, the memory is not
+owned by the pipeline objects; `needs_restart` is set so a supervisor can
+replace the whole process.
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+from agents.orchestrator import Orchestrator
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (0.0 if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # Peak, not current, RSS — the closest portable fallback.
+        # ru_maxrss is bytes on macOS and KB elsewhere.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except (ImportError, OSError):
+        return 0.0
+
+
+class MemoryTracer:
+    """Per-stage tracemalloc deltas; only active while a sample is running."""
+
+    def __init__(self):
+        self.active = False
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.active:
+            yield
+            return
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            delta_kb = (tracemalloc.get_traced_memory()[0] - before) / 1024
+            stats = self.stages.setdefault(
+                name, {"samples": 0, "total_kb": 0.0, "max_kb": 0.0, "last_kb": 0.0}
+            )
+            stats["samples"] += 1
+            stats["total_kb"] += delta_kb
+            stats["last_kb"] = delta_kb
+            stats["max_kb"] = max(stats["max_kb"], delta_kb)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "samples": int(s["samples"]),
+                "avg_kb": round(s["total_kb"] / s["samples"], 3) if s["samples"] else 0.0,
+                "max_kb": round(s["max_kb"], 3),
+                "last_kb": round(s["last_kb"], 3),
+            }
+            for name, s in self.stages.items()
+        }
+
+
+class PipelineWorker:
+    def __init__(
+        self,
+        max_reports: Optional[int] = 10000,
+        max_rss_mb: Optional[float] = None,
+        sample_every: int = 100,
+        leak_window: int = 20,
+        leak_threshold_kb: float = 1.0,
+        mode: str = "offline",
+    ):
+        self.max_reports = max_reports
+        self.max_rss_mb = max_rss_mb
+        self.sample_every = sample_every
+        self.mode = mode
+        self.leak_threshold_kb = leak_threshold_kb
+
+        self.tracer = MemoryTracer()
+        self.orchestrator = Orchestrator(mode=mode, tracer=self.tracer)
+
+        self.started_at = time.time()
+        self.reports_total = 0
+        self.reports_since_recycle = 0
+        self.errors_total = 0
+        self.recycles = 0
+        self.needs_restart = False
+        self.report_deltas_kb = deque(maxlen=leak_window)
+        self.baseline_rss_mb = current_rss_mb()
+        self.last_rss_mb = self.baseline_rss_mb
+
+    def _should_sample(self) -> bool:
+        return self.sample_every > 0 and self.reports_total % self.sample_every == 0
+
+    def _probe(self, report_text: str, sex: str):
+        """
+        Traced probe run of a report whose result is discarded, so the
+        retained delta covers only what the pipeline itself keeps alive.
+        tracemalloc slows allocation noticeably, so it is only switched on
+        around probes unless the caller is already tracing.
+        """
+        owns_tracing = not tracemalloc.is_tracing()
+        if owns_tracing:
+            tracemalloc.start()
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        self.tracer.active = True
+        try:
+            self.orchestrator.run_pipeline(report_text, sex=sex)
+        finally:
+            self.tracer.active = False
+        gc.collect()
+        self.report_deltas_kb.append((tracemalloc.get_traced_memory()[0] - before) / 1024)
+        if owns_tracing:
+            tracemalloc.stop()
+
+    def recycle(self):
+        """Drop the current Orchestrator and build a fresh one."""
+        self.orchestrator = None
+        gc.collect()
+        self.orchestrator = Orchestrator(mode=self.mode, tracer=self.tracer)
+        self.reports_since_recycle = 0
+        self.recycles += 1
+        self.last_rss_mb = current_rss_mb()
+        if self.max_rss_mb is not None and self.last_rss_mb > self.max_rss_mb:
+            self.needs_restart = True
+
+    def process(self, report_text: str, sex: str = "all") -> Dict[str, Any]:
+        if self._should_sample():
+            self._probe(report_text, sex)
+        result = self.orchestrator.run_pipeline(report_text, sex=sex)
+
+        self.reports_total += 1
+        self.reports_since_recycle += 1
+        if result.get("error"):
+            self.errors_total += 1
+
+        if self.max_reports and self.reports_since_recycle >= self.max_reports:
+            self.recycle()
+        elif self.max_rss_mb is not None:
+            self.last_rss_mb = current_rss_mb()
+            # Once a recycle has failed to get under the limit, recycling
+            # again won't help; leave the restart to the supervisor.
+            if self.last_rss_mb > self.max_rss_mb and not self.needs_restart:
+                self.recycle()
+
+        return result
+
+    def leak_suspected(self) -> bool:
+        window = self.report_deltas_kb
+        return (
+            len(window) == window.maxlen
+            and all(d > self.leak_threshold_kb for d in window)
+        )
+
+    def health(self) -> Dict[str, Any]:
+        deltas = list(self.report_deltas_kb)
+        rss = current_rss_mb()
+        return {
+            "status": "restart" if self.needs_restart else "ok",
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "reports_total": self.reports_total,
+            "reports_since_recycle": self.reports_since_recycle,
+            "errors_total": self.errors_total,
+            "recycles": self.recycles,
+            "rss_mb": round(rss, 3),
+            "rss_growth_mb": round(rss - self.baseline_rss_mb, 3),
+            "report_delta_kb": {
+                "samples": len(deltas),
+                "avg": round(sum(deltas) / len(deltas), 3) if deltas else 0.0,
+                "last": round(deltas[-1], 3) if deltas else 0.0,
+            },
+            "stages": self.tracer.summary(),
+            "leak_suspected": self.leak_suspected(),
+            "needs_restart": self.needs_restart,
+        }
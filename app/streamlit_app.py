@@ -2,7 +2,6 @@ import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import streamlit as st
-import pdfplumber
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,6 +11,7 @@ OPENAI_KEY = os.getenv("OPENAI_API_KEY")
 from agents.orchestrator import Orchestrator
 from agents.safety_agent import SafetyAgent
 from memory.session_service import SessionService
+from tools.pdf_text import PDFTextExtractor
 
 st.set_page_config(page_title="AI Medical Summary Assistant", layout="wide")
 st.title("🩺 AI Medical Summary Assistant")
@@ -27,8 +27,14 @@ if "interpreted" not in st.session_state:
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 
-safety = SafetyAgent()
-session = SessionService()
+@st.cache_resource
+def get_agents():
+    # Built once per server process; Streamlit reruns the script on every
+    # interaction and would otherwise allocate fresh agents each time.
+    return Orchestrator(mode="offline"), SafetyAgent(), SessionService(), PDFTextExtractor()
+
+
+orch, safety, session, pdf_reader = get_agents()
 
 with tab1:
     sex = st.selectbox("Sex", ["all", "male", "female"], index=0)
@@ -37,9 +43,8 @@ with tab1:
 
     if uploaded is not None and not text_input.strip():
         try:
-            with pdfplumber.open(uploaded) as pdf:
-                pages = [p.extract_text() or "" for p in pdf.pages]
-                text_input = "\n".join(pages)
+            # Image-only (scanned) pages fall back to OCR when Tesseract is installed
+            text_input = pdf_reader.extract_text(uploaded)
         except Exception as e:
             st.error(f"Failed to read PDF: {e}")
 
@@ -48,8 +53,6 @@ with tab1:
             st.warning("Please paste text or upload a PDF.")
         else:
             st.session_state.chat_history = []  # reset chat
-            orch = Orchestrator(mode="offline")
-
             with st.spinner("Running multi-agent pipeline..."):
                 out = orch.run_pipeline(text_input, sex=sex)
 
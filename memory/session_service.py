@@ -4,15 +4,17 @@ import os
 from datetime import datetime
 
 SESSIONS_DIR = ".sessions"
-os.makedirs(SESSIONS_DIR, exist_ok=True)
 
 class SessionService:
-    def __init__(self):
-        pass
+    def __init__(self, sessions_dir: str = SESSIONS_DIR):
+        # Created lazily on first save, not at import time, so importing this
+        # module from a long-running worker has no filesystem side effects.
+        self.sessions_dir = sessions_dir
 
     def save_report(self, payload: dict):
+        os.makedirs(self.sessions_dir, exist_ok=True)
         ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-        path = os.path.join(SESSIONS_DIR, f"report_{ts}.json")
+        path = os.path.join(self.sessions_dir, f"report_{ts}.json")
         with open(path, "w", encoding="utf-8") as f:
             json.dump(payload, f, indent=2)
         return path
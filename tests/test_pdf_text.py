@@ -0,0 +1,131 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+pytest.importorskip("PIL")
+
+from tools.pdf_text import OCRCache, PDFTextExtractor, new_stats, ocr_available
+from tools.scanned_pdf import scanned_pdf as write_scanned_pdf
+
+
+@pytest.fixture
+def scanned_pdf(tmp_path):
+    """Build a small image-only PDF (one page per text) and return its path."""
+    def build(texts, name="scan.pdf"):
+        return write_scanned_pdf(tmp_path / name, texts, size=(850, 1100), dpi=100.0)
+    return build
+
+
+class StubOCR:
+    """Returns a per-image id and records how many calls overlap."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = fail_on
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, png, lang):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        if call in self.fail_on:
+            raise RuntimeError("ocr failed")
+        return "page " + hashlib.md5(png).hexdigest()[:8], 0.0
+
+
+def test_scanned_page_without_ocr_is_empty(scanned_pdf):
+    path = scanned_pdf(["Hemoglobin: 11.2 g/dL"])
+    stats = new_stats()
+    assert list(PDFTextExtractor(ocr=False).iter_pages(path, stats=stats)) == [""]
+    assert stats['pages'] == 1
+
+def test_ocr_queue_keeps_page_order_and_caches(scanned_pdf):
+    path = scanned_pdf([f"Report page {i}" for i in range(5)])
+    stub = StubOCR()
+    ext = PDFTextExtractor(workers=2, max_pending=1, ocr_fn=stub,
+                           executor_cls=ThreadPoolExecutor, resolution=50)
+    stats = new_stats()
+    pages = list(ext.iter_pages(path, stats=stats))
+    assert len(set(pages)) == 5 and all(p.startswith("page ") for p in pages)
+    assert stub.max_running == 1
+    assert stats['ocr_pages'] == 5 and stats['cache_hits'] == 0
+
+    encoded = []
+    ext._encode = lambda img: encoded.append(img) or b""
+    stats = new_stats()
+    assert list(ext.iter_pages(path, stats=stats)) == pages
+    assert stats['cache_hits'] == 5 and stats['ocr_pages'] == 0
+    assert stub.calls == 5
+    assert encoded == []  # cache hits skip the PNG encode
+
+def test_ocr_failure_loses_only_that_page(scanned_pdf):
+    path = scanned_pdf(["a", "b", "c"])
+    ext = PDFTextExtractor(workers=1, ocr_fn=StubOCR(fail_on=(2,)),
+                           executor_cls=ThreadPoolExecutor, resolution=50)
+    stats = new_stats()
+    pages = list(ext.iter_pages(path, stats=stats))
+    assert pages[1] == "" and pages[0] and pages[2]
+    assert stats['ocr_errors'] == 1
+
+def test_render_failure_loses_only_that_page(scanned_pdf):
+    path = scanned_pdf(["a", "b", "c"])
+    ext = PDFTextExtractor(workers=1, ocr_fn=StubOCR(),
+                           executor_cls=ThreadPoolExecutor, resolution=50)
+    render = ext._page_image
+
+    def flaky_render(page):
+        if page.page_number == 2:
+            raise RuntimeError("pdfium failed")
+        return render(page)
+    ext._page_image = flaky_render
+    stats = new_stats()
+    pages = list(ext.iter_pages(path, stats=stats))
+    assert pages[1] == "" and pages[0] and pages[2]
+    assert stats['ocr_errors'] == 1 and stats['ocr_pages'] == 2
+
+def test_cache_is_bounded_and_keyed_by_lang(scanned_pdf):
+    path = scanned_pdf(["a", "b", "c"])
+    cache = OCRCache(max_entries=2)
+    PDFTextExtractor(workers=1, cache=cache, ocr_fn=StubOCR(),
+                     executor_cls=ThreadPoolExecutor, resolution=50).extract_text(path)
+    assert len(cache._mem) == 2
+
+    ext = PDFTextExtractor(workers=1, cache=cache, ocr_fn=StubOCR(), lang="deu",
+                           executor_cls=ThreadPoolExecutor, resolution=50)
+    stats = new_stats()
+    ext.extract_text(path, stats=stats)
+    assert stats['cache_hits'] == 0
+
+def test_shared_extractor_across_threads(scanned_pdf):
+    path = scanned_pdf(["a", "b", "c", "d"])
+    ext = PDFTextExtractor(workers=1, cache=OCRCache(max_entries=1), ocr_fn=StubOCR(),
+                           executor_cls=ThreadPoolExecutor, resolution=50)
+    per_call = [new_stats() for _ in range(6)]
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        texts = list(pool.map(lambda st: ext.extract_text(path, stats=st), per_call))
+    assert len(set(texts)) == 1
+    assert all(st['pages'] == 4 for st in per_call)
+
+@pytest.mark.skipif(not ocr_available(), reason="tesseract not installed")
+def test_scanned_pages_are_ocrd_and_cached(scanned_pdf, tmp_path):
+    path = scanned_pdf(["Hemoglobin: 11.2 g/dL", "Glucose: 95 mg/dL"])
+    ext = PDFTextExtractor(workers=2, cache=OCRCache(cache_dir=str(tmp_path / "cache")))
+    stats = new_stats()
+    text = ext.extract_text(path, stats=stats).lower()
+    assert "hemoglobin" in text and "glucose" in text
+    assert stats['ocr_pages'] == 2
+
+    stats = new_stats()
+    assert ext.extract_text(path, stats=stats).lower() == text
+    assert stats['cache_hits'] == 2
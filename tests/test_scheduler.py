@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from agents.scheduler import PriorityScheduler
+
+URGENT = "Glucose: 420 mg/dL"
+ROUTINE = "Hemoglobin: 14.0 g/dL"
+
+
+class SlowInsights:
+    def run(self, facts):
+        time.sleep(0.01)
+        return {"insights": []}
+
+
+def test_batch_completes_urgent_first():
+    order, alerts = [], []
+    sched = PriorityScheduler(
+        insight_agent=SlowInsights(),
+        on_alert=lambda rid, items: alerts.append(rid),
+        on_result=lambda rid, res: order.append(rid),
+        workers=1,
+    )
+    reports = [{"id": i, "text": ROUTINE} for i in range(5)]
+    reports.append({"id": "urgent", "text": URGENT})
+    results = sched.run_batch(reports)
+
+    assert alerts == ["urgent"]
+    assert order[0] == "urgent"
+    assert results["urgent"]["priority"] == "high"
+    assert results[0]["priority"] == "normal"
+    assert sched.stats()["high"]["count"] == 1
+    assert sched.stats()["normal"]["count"] == 5
+
+def test_service_mode_delivers_all():
+    results = {}
+    sched = PriorityScheduler(on_result=lambda rid, res: results.update({rid: res}))
+    sched.start()
+    sched.submit("a", URGENT)
+    sched.submit("b", ROUTINE)
+    sched.submit("c", "")
+    sched.stop()
+    assert results["a"]["alerts"][0]["name"] == "glucose"
+    assert results["b"]["error"] is False
+    assert results["c"]["error"] is True
+    for res in results.values():
+        assert res["priority"] in ("high", "normal")
+        assert isinstance(res["alerts"], list)
+    assert results["c"]["priority"] == "normal" and results["c"]["alerts"] == []
+
+def test_service_and_batch_modes_do_not_overlap():
+    sched = PriorityScheduler(workers=1)
+    sched.start()
+    try:
+        with pytest.raises(RuntimeError):
+            sched.start()
+        with pytest.raises(RuntimeError):
+            sched.run_batch([{"id": 1, "text": ROUTINE}])
+    finally:
+        sched.stop()
+    assert sched.run_batch([{"id": 1, "text": ROUTINE}])[1]["error"] is False
+
+def test_insight_failure_keeps_result():
+    class FailingInsights:
+        def run(self, facts):
+            raise TimeoutError("llm timed out")
+
+    sched = PriorityScheduler(insight_agent=FailingInsights(), workers=1)
+    res = sched.run_batch([{"id": "r", "text": ROUTINE}])["r"]
+    assert res["error"] is False
+    assert res["safe_summary"]
+    assert res["insights"]["error"] is True
+
+def test_failing_callbacks_do_not_drop_reports():
+    seen = []
+
+    def on_result(rid, res):
+        seen.append(rid)
+        if rid == 1:
+            raise RuntimeError("callback failed")
+
+    def on_alert(rid, items):
+        raise RuntimeError("alert failed")
+
+    sched = PriorityScheduler(on_result=on_result, on_alert=on_alert, workers=1)
+    results = sched.run_batch([{"id": i, "text": ROUTINE} for i in range(4)] + [{"id": "u", "text": URGENT}])
+    assert sorted(results, key=str) == [0, 1, 2, 3, "u"]
+    assert len(seen) == 5
+
+    sched.start()
+    sched.submit(1, ROUTINE)
+    sched.submit(2, ROUTINE)
+    sched.stop()
+    assert seen[-2:] == [1, 2]
+
+def test_insight_agent_gets_hba1c():
+    from agents.adk_med_agent import ADKMedAgent
+
+    delivered = {}
+    sched = PriorityScheduler(insight_agent=ADKMedAgent(),
+                              on_result=lambda rid, res: delivered.update({rid: res}))
+    pre = {"extracted": [], "urgent": [],
+           "interpreted": [{"name": "a1c", "value": 7.2, "status": "unknown", "explanation": ""}]}
+    sched._complete("r", pre, 1)
+    assert any("Blood sugar" in line for line in delivered["r"]["insights"]["insights"])
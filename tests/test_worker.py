@@ -0,0 +1,51 @@
+from agents.worker import PipelineWorker
+from tools.soak_test import run_soak
+
+REPORT = "Hemoglobin: 11.2 g/dL\nGlucose: 350 mg/dL"
+
+def test_worker_recycles_after_max_reports():
+    worker = PipelineWorker(max_reports=3, sample_every=0)
+    for _ in range(7):
+        out = worker.process(REPORT)
+        assert out['error'] is False
+    health = worker.health()
+    assert health['recycles'] == 2
+    assert health['reports_since_recycle'] == 1
+
+def test_worker_reports_stage_memory():
+    worker = PipelineWorker(sample_every=1)
+    worker.process(REPORT)
+    stages = worker.health()['stages']
+    assert set(stages) == {'extract', 'interpret', 'summarize', 'safety', 'recommend'}
+    assert worker.health()['report_delta_kb']['samples'] == 1
+
+def test_short_soak_is_flat():
+    ok, health = run_soak(reports=3000, max_reports=500, sample_every=100, log_every=0)
+    assert ok, health
+
+def test_worker_stops_rss_recycling_once_restart_needed():
+    worker = PipelineWorker(max_reports=None, max_rss_mb=1, sample_every=0)
+    for _ in range(5):
+        worker.process(REPORT)
+    health = worker.health()
+    assert health['recycles'] == 1
+    assert health['needs_restart'] is True
+
+def test_rss_fallback_units(monkeypatch):
+    import builtins
+    import resource
+    import sys
+    from types import SimpleNamespace
+    from agents.worker import current_rss_mb
+
+    def no_proc(*args, **kwargs):
+        raise OSError
+    monkeypatch.setattr(builtins, "open", no_proc)
+
+    monkeypatch.setattr(sys, "platform", "darwin")  # ru_maxrss in bytes
+    monkeypatch.setattr(resource, "getrusage", lambda who: SimpleNamespace(ru_maxrss=200 * 1024 * 1024))
+    assert current_rss_mb() == 200
+
+    monkeypatch.setattr(sys, "platform", "linux")  # ru_maxrss in KB
+    monkeypatch.setattr(resource, "getrusage", lambda who: SimpleNamespace(ru_maxrss=200 * 1024))
+    assert current_rss_mb() == 200
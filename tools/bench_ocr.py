@@ -0,0 +1,63 @@
+"""
+Benchmark the OCR fallback on generated scanned (image-only) PDFs.
+
+    python -m tools.bench_ocr --pdfs 10 --pages 4 --workers 4
+
+Reports pages/sec and OCR CPU seconds per page for a cold run, then a second
+pass over the same files to show the page-hash cache.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+from tools.pdf_text import OCRCache, PDFTextExtractor, new_stats, ocr_available
+from tools.scanned_pdf import scanned_pdf
+from tools.soak_test import synthetic_report
+
+
+def run_pass(files, extractor):
+    s = new_stats()
+    for path in files:
+        extractor.extract_text(path, stats=s)
+    s["pages_per_s"] = round(s["pages"] / s["wall_s"], 3) if s["wall_s"] else 0.0
+    s["cpu_s_per_ocr_page"] = round(s["ocr_cpu_s"] / s["ocr_pages"], 4) if s["ocr_pages"] else 0.0
+    s["wall_s"] = round(s["wall_s"], 3)
+    s["ocr_cpu_s"] = round(s["ocr_cpu_s"], 3)
+    return s
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pdfs", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if not ocr_available():
+        print("[bench_ocr] pytesseract / tesseract binary not available", file=sys.stderr)
+        return 1
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(args.pdfs):
+            path = os.path.join(tmp, f"scan_{i}.pdf")
+            scanned_pdf(path, [synthetic_report(rng) for _ in range(args.pages)])
+            files.append(path)
+
+        extractor = PDFTextExtractor(workers=args.workers, cache=OCRCache(cache_dir=None))
+        result = {
+            "workers": extractor.workers,
+            "cold": run_pass(files, extractor),
+            "cached": run_pass(files, extractor),
+        }
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+PDF text extraction with an OCR fallback for scanned (image-only) pages.
+
+pdfplumber's extract_text() returns None/"" for pages that are just an image.
+Only those pages are rendered and OCR'd with Tesseract; the OCR runs in a
+process pool with a bounded number of pages in flight, and text is cached by
+a hash of the rendered page image (plus OCR language) in a bounded LRU, so
+re-uploads don't pay for OCR again. The cache is memory-only unless a
+cache_dir is configured: OCR'd report text is patient data.
+
+Page texts are yielded in page order, so callers can feed them straight into
+the same "\n".join(...) input that ExtractorAgent.run() already receives.
+
+OCR needs `pytesseract` + `Pillow` (requirements-ocr.txt) and the `tesseract`
+binary; without them, or if rendering or OCR fails on a page, that page stays empty,
+exactly as before.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import pdfplumber
+
+try:
+    import pytesseract
+except ImportError:  # optional dependency
+    pytesseract = None
+
+OCR_RESOLUTION = 300
+OCR_CACHE_ENTRIES = 256
+
+
+def new_stats() -> dict:
+    """Fresh counters for one PDFTextExtractor.iter_pages() call."""
+    return {
+        "pages": 0, "text_pages": 0, "ocr_pages": 0, "cache_hits": 0,
+        "ocr_errors": 0, "ocr_cpu_s": 0.0, "wall_s": 0.0,
+    }
+
+
+def ocr_available() -> bool:
+    if pytesseract is None:
+        return False
+    try:
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def _ocr_png(png_bytes: bytes, lang: str):
+    """Worker: OCR one rendered page. Returns (text, cpu_seconds)."""
+    from PIL import Image
+
+    # Tesseract runs as a child process of the worker, so count its CPU too.
+    before = os.times()
+    with Image.open(io.BytesIO(png_bytes)) as img:
+        text = pytesseract.image_to_string(img, lang=lang)
+    after = os.times()
+    cpu = sum(after[:4]) - sum(before[:4])  # user + system, self + children
+    return text, cpu
+
+
+class OCRCache:
+    """
+    Page-image-hash → text. A bounded in-memory LRU, optionally backed by a
+    directory (opt-in; nothing is written to disk by default). Thread-safe:
+    the Streamlit app shares one cache across sessions.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=OCR_CACHE_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key, text):
+        # Caller holds self._lock
+        self._mem[key] = text
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def get(self, key):
+        with self._lock:
+            text = self._mem.get(key)
+            if text is not None:
+                self._mem.move_to_end(key)
+                return text
+        if self.cache_dir and os.path.exists(self._path(key)):
+            with open(self._path(key), encoding="utf-8") as f:
+                text = f.read()
+            with self._lock:
+                self._remember(key, text)
+            return text
+        return None
+
+    def put(self, key, text):
+        with self._lock:
+            self._remember(key, text)
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._path(key), "w", encoding="utf-8") as f:
+                f.write(text)
+
+
+class PDFTextExtractor:
+    def __init__(self, workers=None, max_pending=None, cache=None,
+                 lang="eng", resolution=OCR_RESOLUTION, ocr=True,
+                 ocr_fn=None, executor_cls=ProcessPoolExecutor):
+        """
+        workers: OCR processes (default: os.cpu_count())
+        max_pending: pages rendered and queued for OCR at once (default: 2 * workers);
+                     bounds memory held by rendered page images
+        cache: OCRCache instance (default: memory-only LRU)
+        ocr_fn: callable(png_bytes, lang) -> (text, cpu_seconds); defaults to Tesseract
+        executor_cls: concurrent.futures executor class the OCR calls run on
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.cache = cache if cache is not None else OCRCache()
+        self.lang = lang
+        self.resolution = resolution
+        self.ocr_fn = ocr_fn or _ocr_png
+        self.executor_cls = executor_cls
+        self.ocr = ocr and (ocr_fn is not None or ocr_available())
+
+    def _page_image(self, page):
+        return page.to_image(resolution=self.resolution).original
+
+    def _image_key(self, img):
+        """Cache key: sha256 of OCR language + pixels."""
+        return hashlib.sha256(
+            f"{self.lang}{img.mode}{img.size}".encode() + img.tobytes()
+        ).hexdigest()
+
+    @staticmethod
+    def _encode(img):
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        return buf.getvalue()
+
+    def iter_pages(self, source, stats=None):
+        """
+        Yield page texts in page order. `source` is a path or file-like object,
+        anything pdfplumber.open() accepts.
+
+        Counters for this call are added to `stats` (see new_stats()). They
+        are per call, not instance state: one extractor is shared by every
+        Streamlit session.
+        """
+        if stats is None:
+            stats = new_stats()
+        start = time.perf_counter()
+        with pdfplumber.open(source) as pdf:
+            if not self.ocr:
+                for page in pdf.pages:
+                    stats["pages"] += 1
+                    text = page.extract_text() or ""
+                    if text.strip():
+                        stats["text_pages"] += 1
+                    yield text
+                stats["wall_s"] += time.perf_counter() - start
+                return
+
+            with self.executor_cls(max_workers=self.workers) as pool:
+                # Slots in page order: a str when ready, else (hash, future).
+                pending = deque()
+                in_flight = 0
+
+                def drain(block):
+                    nonlocal in_flight
+                    while pending:
+                        head = pending[0]
+                        if not isinstance(head, str):
+                            key, fut = head
+                            if not block and not fut.done():
+                                return
+                            in_flight -= 1
+                            try:
+                                text, cpu = fut.result()
+                            except Exception:
+                                # Lose only this page, not the whole document
+                                stats["ocr_errors"] += 1
+                                text = ""
+                            else:
+                                stats["ocr_cpu_s"] += cpu
+                                self.cache.put(key, text)
+                            head = text
+                        pending.popleft()
+                        yield head
+
+                for page in pdf.pages:
+                    stats["pages"] += 1
+                    text = page.extract_text() or ""
+                    if text.strip():
+                        stats["text_pages"] += 1
+                        pending.append(text)
+                        yield from drain(block=False)
+                        continue
+
+                    try:
+                        img = self._page_image(page)
+                        key = self._image_key(img)
+                    except Exception:
+                        # Unrenderable page: empty, as without OCR
+                        stats["ocr_errors"] += 1
+                        pending.append("")
+                        yield from drain(block=False)
+                        continue
+
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        stats["cache_hits"] += 1
+                        pending.append(cached)
+                    else:
+                        # Bounded queue: wait for the oldest OCR before
+                        # queueing another page image.
+                        while in_flight >= self.max_pending:
+                            _, oldest = next(s for s in pending if not isinstance(s, str))
+                            wait([oldest])
+                            yield from drain(block=False)
+                        # PNG-encode only on a cache miss
+                        try:
+                            png = self._encode(img)
+                        except Exception:
+                            stats["ocr_errors"] += 1
+                            pending.append("")
+                        else:
+                            stats["ocr_pages"] += 1
+                            pending.append((key, pool.submit(self.ocr_fn, png, self.lang)))
+                            in_flight += 1
+                    del img
+                    yield from drain(block=False)
+                yield from drain(block=True)
+
+        stats["wall_s"] += time.perf_counter() - start
+
+    def extract_text(self, source, stats=None) -> str:
+        return "\n".join(self.iter_pages(source, stats=stats))
@@ -0,0 +1,22 @@
+"""
+Generate image-only ("scanned") PDFs for the OCR benchmark and tests.
+Needs Pillow.
+"""
+from PIL import Image, ImageDraw, ImageFont
+
+
+def scanned_pdf(path, texts, size=(1700, 2200), dpi=200.0):
+    """Write one image-only PDF page per text, like a flatbed scan at `dpi`."""
+    font_size = max(12, int(36 * size[0] / 1700))
+    try:
+        font = ImageFont.load_default(size=font_size)
+    except TypeError:  # Pillow < 10.1
+        font = ImageFont.load_default()
+    pages = []
+    for text in texts:
+        img = Image.new("L", size, color=255)
+        ImageDraw.Draw(img).multiline_text((size[0] // 14, size[0] // 14), text,
+                                           fill=0, font=font, spacing=font_size * 2 // 3)
+        pages.append(img)
+    pages[0].save(path, save_all=True, append_images=pages[1:], resolution=dpi)
+    return path
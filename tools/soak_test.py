@@ -0,0 +1,95 @@
+"""
+Soak test for PipelineWorker: push synthetic reports through one worker and
+assert that RSS stays flat after warm-up.
+
+    python -m tools.soak_test                      # 10^6 reports
+    python -m tools.soak_test --reports 20000 --max-growth-mb 2
+"""
+import argparse
+import json
+import random
+import sys
+
+from agents.worker import PipelineWorker, current_rss_mb
+
+TEMPLATES = [
+    "Hemoglobin: {hb} g/dL",
+    "WBC: {wbc} x10^3/µL",
+    "RBC: {rbc}",
+    "Platelets: {plt}",
+    "Total Cholesterol: {chol} mg/dL",
+    "Fasting Glucose: {glu} mg/dL",
+    "Creatinine: {cr} mg/dL",
+    "HbA1c: {a1c} %",
+]
+
+
+def synthetic_report(rng: random.Random) -> str:
+    values = {
+        "hb": round(rng.uniform(8, 19), 1),
+        "wbc": round(rng.uniform(2, 25), 1),
+        "rbc": round(rng.uniform(3, 7), 2),
+        "plt": rng.randint(50, 600),
+        "chol": rng.randint(120, 320),
+        "glu": rng.randint(50, 400),
+        "cr": round(rng.uniform(0.4, 4.0), 2),
+        "a1c": round(rng.uniform(4, 11), 1),
+    }
+    lines = rng.sample(TEMPLATES, rng.randint(2, len(TEMPLATES)))
+    return "LAB REPORT\n" + "\n".join(t.format(**values) for t in lines)
+
+
+def run_soak(reports=10**6, warmup=None, max_growth_mb=5.0, seed=0,
+             max_reports=10000, sample_every=1000, log_every=100000):
+    """Returns (ok, health). Memory is measured from the end of warm-up."""
+    if warmup is None:
+        warmup = min(10000, max(reports // 10, 1))
+    rng = random.Random(seed)
+    worker = PipelineWorker(max_reports=max_reports, sample_every=sample_every)
+
+    for _ in range(warmup):
+        worker.process(synthetic_report(rng), sex=rng.choice(["all", "male", "female"]))
+    start_rss = current_rss_mb()
+
+    for i in range(1, reports - warmup + 1):
+        worker.process(synthetic_report(rng), sex=rng.choice(["all", "male", "female"]))
+        if log_every and i % log_every == 0:
+            print(f"[soak] {i + warmup} reports, rss={current_rss_mb():.1f} MB", file=sys.stderr)
+
+    health = worker.health()
+    health["soak_rss_growth_mb"] = round(current_rss_mb() - start_rss, 3)
+    ok = (
+        health["soak_rss_growth_mb"] <= max_growth_mb
+        and not health["leak_suspected"]
+        and health["errors_total"] == 0
+    )
+    return ok, health
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reports", type=int, default=10**6)
+    parser.add_argument("--warmup", type=int, default=None)
+    parser.add_argument("--max-growth-mb", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--recycle-every", type=int, default=10000)
+    parser.add_argument("--sample-every", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    ok, health = run_soak(
+        reports=args.reports,
+        warmup=args.warmup,
+        max_growth_mb=args.max_growth_mb,
+        seed=args.seed,
+        max_reports=args.recycle_every,
+        sample_every=args.sample_every,
+    )
+    print(json.dumps(health, indent=2))
+    if not ok:
+        print("[soak] FAILED: memory not flat", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())